@@ -24,91 +24,297 @@
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import os
 from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
 from pathlib import Path
+from typing import Any
 
 import hydra
 import pandas as pd
-from omegaconf import DictConfig
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from omegaconf import DictConfig, OmegaConf
 
 from sports_forecast.utils.log_config import get_logger
 
 
 #: Корень проекта: sports_forecast/data/clean.py -> sports_forecast -> project_root
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+#: Размер батча при потоковом чтении Parquet: ограничивает пиковую память
+#: одним батчем и позволяет перекрывать чтение следующего батча с обработкой
+BATCH_SIZE = 65_536
+
+#: Целевой размер row-group в выходном interim-файле: крупные группы
+#: уменьшают накладные расходы на метаданные при сканировании в фича-слое
+ROW_GROUP_SIZE = 1_000_000
+
 logger = get_logger(__name__)
 
 
+def _resolve_read_columns(
+    cfg: DictConfig,
+    schema_names: list[str],
+    tournament_name: str,
+) -> list[str] | None:
+    """Вычислить минимальный набор raw-колонок, который нужно читать из Parquet.
+
+    Собирает объединение select_columns, required_columns, drop_na_columns
+    и ключей dtype_mapping (все они — в «новых» именах после маппинга),
+    переводит его обратно в raw-имена через обратный column_mapping
+    и оставляет только колонки, реально присутствующие в файле.
+
+    Args:
+        cfg: Hydra-конфиг с параметрами очистки.
+        schema_names: Список колонок в схеме raw-файла.
+        tournament_name: Название турнира (для логирования).
+
+    Returns:
+        Список raw-колонок для проекции или None, если проекция не нужна
+        (например, select_columns не задан — тогда читаем всё).
+    """
+    clean_cfg = cfg.clean
+
+    select_cols = list(clean_cfg.select_columns or [])
+    if not select_cols:
+        return None
+
+    needed_new: set[str] = set(select_cols)
+    needed_new.update(clean_cfg.required_columns or [])
+    needed_new.update(clean_cfg.drop_na_columns or [])
+
+    dtype_cfg = getattr(clean_cfg, "dtype_mapping", None)
+    if dtype_cfg:
+        if getattr(dtype_cfg, "numeric", None):
+            needed_new.update(dict(dtype_cfg.numeric))
+        if getattr(dtype_cfg, "string", None):
+            needed_new.update(dtype_cfg.string)
+        if getattr(dtype_cfg, "datetime", None):
+            needed_new.update(dict(dtype_cfg.datetime))
+
+    # Обратный маппинг: новое имя -> список raw-имен (одно новое имя может
+    # соответствовать нескольким raw-вариантам из разных турниров)
+    mapping = dict(getattr(clean_cfg, "column_mapping", None) or {})
+    inverse: dict[str, list[str]] = {}
+    for raw_name, new_name in mapping.items():
+        inverse.setdefault(new_name, []).append(raw_name)
+
+    needed_raw: set[str] = set()
+    for new_name in needed_new:
+        needed_raw.update(inverse.get(new_name, []))
+        # Колонка могла изначально называться «правильно»
+        needed_raw.add(new_name)
+
+    read_columns = [c for c in schema_names if c in needed_raw]
+    if not read_columns:
+        logger.warning(
+            "Турнир %s: ни одна из нужных колонок %s не найдена в raw-схеме, читаю всё",
+            tournament_name,
+            sorted(needed_new),
+        )
+        return None
+
+    logger.debug(
+        "Турнир %s: проекция чтения: %d/%d колонок",
+        tournament_name,
+        len(read_columns),
+        len(schema_names),
+    )
+    return read_columns
+
+
 def _apply_column_mapping(
-    df: pd.DataFrame,
+    table: pa.Table,
     mapping: dict[str, str],
     tournament_name: str,
-) -> pd.DataFrame:
+) -> pa.Table:
     """Применить маппинг колонок для унификации названий.
 
     Args:
-        df: Исходный датафрейм.
+        table: Исходная Arrow-таблица.
         mapping: Словарь {старое_название: новое_название}.
         tournament_name: Название турнира (для логирования).
 
     Returns:
-        Датафрейм с переименованными колонками.
+        Таблица с переименованными колонками (операция над метаданными,
+        данные не копируются).
     """
-    # Находим только те колонки, которые реально есть в датафрейме
+    # Находим только те колонки, которые реально есть в таблице
     rename_dict = {
-        old_name: new_name for old_name, new_name in mapping.items() if old_name in df.columns
+        old_name: new_name
+        for old_name, new_name in mapping.items()
+        if old_name in table.column_names
     }
 
     if rename_dict:
-        logger.info(
+        logger.debug(
             "Турнир %s: применяю маппинг колонок: %s",
             tournament_name,
             rename_dict,
         )
-        df = df.rename(columns=rename_dict)
+        table = table.rename_columns([rename_dict.get(c, c) for c in table.column_names])
     else:
         logger.debug(
             "Турнир %s: маппинг не требуется, все колонки уже в нужном формате",
             tournament_name,
         )
 
-    return df
+    return table
+
+
+def _set_column(table: pa.Table, col: str, array: pa.ChunkedArray | pa.Array) -> pa.Table:
+    """Заменить колонку таблицы новым массивом, сохранив её позицию."""
+    index = table.column_names.index(col)
+    return table.set_column(index, pa.field(col, array.type), array)
+
+
+def _build_target_schema(table: pa.Table, spec: dict[str, Any]) -> pa.Schema | None:
+    """Собрать целевую схему для единого батчевого каста всей таблицы.
+
+    Args:
+        table: Таблица, которую предстоит типизировать.
+        spec: Развёрнутый dtype_mapping (plain-словарь).
+
+    Returns:
+        Целевая схема, если все касты выразимы одним table.cast,
+        или None — когда кастовать нечего либо есть колонки, требующие
+        поэлементной обработки (парсинг дат по явному формату).
+    """
+    numeric_map = spec.get("numeric") or {}
+    string_cols = set(spec.get("string") or [])
+    datetime_map = spec.get("datetime") or {}
+
+    fields = []
+    changed = False
+    for field in table.schema:
+        name, current = field.name, field.type
+        target = current
+
+        if name in numeric_map:
+            target = pa.int64() if numeric_map[name] == "int" else pa.float64()
+        elif name in string_cols:
+            if not (pa.types.is_string(current) or pa.types.is_large_string(current)):
+                target = pa.string()
+        elif name in datetime_map:
+            params = datetime_map[name]
+            dt_format = params.get("format") if isinstance(params, dict) else None
+            if dt_format:
+                # Явный формат требует strptime — батчевым кастом не выразить
+                return None
+            if not pa.types.is_timestamp(current):
+                target = pa.timestamp("ns")
+
+        if target != current:
+            changed = True
+        fields.append(pa.field(name, target))
+
+    return pa.schema(fields) if changed else None
 
 
 def _apply_dtype_conversion(
-    df: pd.DataFrame,
+    table: pa.Table,
     dtype_config: DictConfig,
     tournament_name: str,
-) -> pd.DataFrame:
+) -> pa.Table:
     """Применить типизацию колонок согласно конфигу.
 
+    Все касты выполняются на уровне Arrow-таблицы (C-ядра над
+    колоночными буферами), без промежуточных pandas-датафреймов.
+
     Args:
-        df: Датафрейм для типизации.
+        table: Arrow-таблица для типизации.
         dtype_config: Конфиг с типами колонок из clean.dtype_mapping.
         tournament_name: Название турнира (для логирования).
 
     Returns:
-        Датафрейм с приведенными типами.
+        Таблица с приведенными типами.
     """
-    if not dtype_config:
+    # Один раз разворачиваем конфиг в plain-словарь: дальше по горячему циклу
+    # идут обычные dict/list вместо __getattr__-доступа OmegaConf на каждую колонку
+    spec: dict[str, Any] = (
+        OmegaConf.to_container(dtype_config, resolve=True) if dtype_config else None
+    ) or {}
+    if not spec:
         logger.debug("Турнир %s: типизация не задана в конфиге", tournament_name)
-        return df
+        return table
+
+    # Быстрый путь: один C-каст всей схемы вместо поколоночного цикла
+    # с try/except на каждую колонку
+    target_schema = _build_target_schema(table, spec)
+    if target_schema is not None:
+        try:
+            casted = table.cast(target_schema, safe=False)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            # В данных есть неконвертируемые значения — поколоночный путь
+            # ниже разберётся с ними и даст подробную диагностику
+            logger.debug(
+                "Турнир %s: батчевый каст схемы не удался, перехожу на поколоночный",
+                tournament_name,
+            )
+        else:
+            # Для int-колонок сохраняем семантику «NaN → 0» поколоночного пути
+            for col, dtype in (spec.get("numeric") or {}).items():
+                if dtype == "int" and col in casted.column_names:
+                    column = casted[col]
+                    if column.null_count:
+                        logger.warning(
+                            "Турнир %s: колонка '%s' - %d пустых значений заполнены нулями",
+                            tournament_name,
+                            col,
+                            column.null_count,
+                        )
+                        casted = _set_column(casted, col, pc.fill_null(column, 0))
+            logger.debug("Турнир %s: типизация применена одним кастом схемы", tournament_name)
+            return casted
 
     total_converted = 0
+    #: Аргументы debug-логов в горячем поколоночном цикле не должны
+    #: форматироваться впустую на уровне INFO (дефолтном)
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
 
     # 1. Числовые колонки
-    if hasattr(dtype_config, "numeric") and dtype_config.numeric:
-        numeric_map = dict(dtype_config.numeric)
-        for col, dtype in numeric_map.items():
-            if col not in df.columns:
+    if spec.get("numeric"):
+        for col, dtype in spec["numeric"].items():
+            if col not in table.column_names:
+                continue
+
+            column = table[col]
+
+            # Тип уже целевой — конвертация была бы полной копией колонки впустую
+            if (dtype == "int" and pa.types.is_integer(column.type)) or (
+                dtype == "float" and pa.types.is_floating(column.type)
+            ):
+                if debug_enabled:
+                    logger.debug(
+                        "Турнир %s: колонка '%s' уже имеет тип %s, пропущена",
+                        tournament_name,
+                        col,
+                        dtype,
+                    )
                 continue
 
             try:
-                # Конвертируем в числа
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+                # Быстрый путь: один C-каст. Через float64, чтобы строки
+                # вида "3.0" парсились и для целевого типа int.
+                try:
+                    converted = pc.cast(column, pa.float64())
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    # Медленный путь: в колонке есть неконвертируемые значения,
+                    # нужна поэлементная коэрция в NaN
+                    coerced = pd.to_numeric(column.to_pandas(), errors="coerce")
+                    converted = pa.chunked_array(
+                        [pa.Array.from_pandas(coerced, type=pa.float64())]
+                    )
 
-                # Подсчитываем NaN после конвертации
-                nan_count = df[col].isna().sum()
+                # Подсчитываем NaN после конвертации: null_count хранится
+                # в метаданных Arrow-массива, O(1) вместо полного прохода
+                nan_count = converted.null_count
                 if nan_count > 0:
                     logger.warning(
                         "Турнир %s: колонка '%s' - %d значений не удалось конвертировать (стали NaN)",
@@ -120,12 +326,12 @@ def _apply_dtype_conversion(
                 # Приводим к нужному типу (int/float)
                 if dtype == "int":
                     # Для int заполняем NaN нулями
-                    df[col] = df[col].fillna(0).astype("int64")
-                elif dtype == "float":
-                    df[col] = df[col].astype("float64")
+                    converted = pc.cast(pc.fill_null(converted, 0.0), pa.int64(), safe=False)
 
+                table = _set_column(table, col, converted)
                 total_converted += 1
-                logger.debug("Турнир %s: колонка '%s' → %s", tournament_name, col, dtype)
+                if debug_enabled:
+                    logger.debug("Турнир %s: колонка '%s' → %s", tournament_name, col, dtype)
             except Exception as e:
                 logger.error(
                     "Турнир %s: не удалось конвертировать '%s' в %s - %s",
@@ -136,16 +342,28 @@ def _apply_dtype_conversion(
                 )
 
     # 2. Строковые колонки
-    if hasattr(dtype_config, "string") and dtype_config.string:
-        string_cols = list(dtype_config.string)
-        for col in string_cols:
-            if col not in df.columns:
+    if spec.get("string"):
+        for col in spec["string"]:
+            if col not in table.column_names:
+                continue
+
+            column = table[col]
+
+            # Уже строковая колонка — каст не нужен
+            if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+                if debug_enabled:
+                    logger.debug(
+                        "Турнир %s: колонка '%s' уже строковая, пропущена",
+                        tournament_name,
+                        col,
+                    )
                 continue
 
             try:
-                df[col] = df[col].astype(str)
+                table = _set_column(table, col, pc.cast(column, pa.string()))
                 total_converted += 1
-                logger.debug("Турнир %s: колонка '%s' → string", tournament_name, col)
+                if debug_enabled:
+                    logger.debug("Турнир %s: колонка '%s' → string", tournament_name, col)
             except Exception as e:
                 logger.error(
                     "Турнир %s: не удалось конвертировать '%s' в string - %s",
@@ -155,21 +373,45 @@ def _apply_dtype_conversion(
                 )
 
     # 3. Datetime колонки
-    if hasattr(dtype_config, "datetime") and dtype_config.datetime:
-        datetime_map = dict(dtype_config.datetime)
-        for col, params in datetime_map.items():
-            if col not in df.columns:
+    if spec.get("datetime"):
+        for col, params in spec["datetime"].items():
+            if col not in table.column_names:
+                continue
+
+            column = table[col]
+
+            # Уже timestamp (например, raw-parquet сохранил тип) — каст не нужен
+            if pa.types.is_timestamp(column.type):
+                if debug_enabled:
+                    logger.debug(
+                        "Турнир %s: колонка '%s' уже datetime, пропущена",
+                        tournament_name,
+                        col,
+                    )
                 continue
 
             try:
-                # Параметры для pd.to_datetime
                 dt_format = params.get("format") if isinstance(params, dict) else None
                 dt_errors = params.get("errors", "coerce") if isinstance(params, dict) else "coerce"
 
-                df[col] = pd.to_datetime(df[col], format=dt_format, errors=dt_errors)
+                is_string_col = pa.types.is_string(column.type) or pa.types.is_large_string(
+                    column.type
+                )
+                if dt_format and is_string_col:
+                    # Быстрый путь: парсинг дат Arrow-ядром по известному формату
+                    converted = pc.strptime(
+                        column,
+                        format=dt_format,
+                        unit="ns",
+                        error_is_null=(dt_errors == "coerce"),
+                    )
+                else:
+                    # Формат неизвестен — оставляем автоопределение pandas
+                    parsed = pd.to_datetime(column.to_pandas(), format=dt_format, errors=dt_errors)
+                    converted = pa.chunked_array([pa.Array.from_pandas(parsed)])
 
-                # Подсчитываем NaT после конвертации
-                nat_count = df[col].isna().sum()
+                # Подсчитываем NaT после конвертации (null_count — O(1), см. выше)
+                nat_count = converted.null_count
                 if nat_count > 0:
                     logger.warning(
                         "Турнир %s: колонка '%s' - %d значений не удалось конвертировать в datetime (стали NaT)",
@@ -178,13 +420,15 @@ def _apply_dtype_conversion(
                         nat_count,
                     )
 
+                table = _set_column(table, col, converted)
                 total_converted += 1
-                logger.debug(
-                    "Турнир %s: колонка '%s' → datetime (format=%s)",
-                    tournament_name,
-                    col,
-                    dt_format or "auto",
-                )
+                if debug_enabled:
+                    logger.debug(
+                        "Турнир %s: колонка '%s' → datetime (format=%s)",
+                        tournament_name,
+                        col,
+                        dt_format or "auto",
+                    )
             except Exception as e:
                 logger.error(
                     "Турнир %s: не удалось конвертировать '%s' в datetime - %s",
@@ -194,31 +438,32 @@ def _apply_dtype_conversion(
                 )
 
     if total_converted > 0:
-        logger.info(
+        logger.debug(
             "Турнир %s: применена типизация к %d колонкам",
             tournament_name,
             total_converted,
         )
 
-    return df
+    return table
 
 
 def _validate_required_columns(
-    df: pd.DataFrame,
+    column_names: Iterable[str],
     required_columns: Iterable[str],
     tournament_name: str,
 ) -> bool:
-    """Проверить наличие обязательных колонок в датафрейме.
+    """Проверить наличие обязательных колонок.
 
     Args:
-        df: Датафрейм с данными турнира.
+        column_names: Колонки, присутствующие в данных турнира.
         required_columns: Список обязательных колонок.
         tournament_name: Имя турнира для логов.
 
     Returns:
         True, если все колонки на месте, иначе False.
     """
-    missing = [col for col in required_columns if col not in df.columns]
+    present = set(column_names)
+    missing = [col for col in required_columns if col not in present]
     if missing:
         logger.error(
             "Турнир %s: отсутствуют обязательные колонки %s, пропускаю турнир",
@@ -229,12 +474,101 @@ def _validate_required_columns(
     return True
 
 
+def _clean_table(
+    table: pa.Table,
+    cfg: DictConfig,
+    tournament_name: str,
+) -> pa.Table | None:
+    """Применить конвейер очистки (маппинг, типизация, dropna, селекция) к таблице.
+
+    Args:
+        table: Arrow-таблица (целый файл или один батч при потоковом чтении).
+        cfg: Hydra-конфиг с параметрами очистки.
+        tournament_name: Название турнира (для логирования).
+
+    Returns:
+        Очищенная таблица или None, если в данных нет ни одной нужной колонки.
+    """
+    # 1. Применяем маппинг колонок (если он задан в конфиге)
+    if hasattr(cfg.clean, "column_mapping") and cfg.clean.column_mapping:
+        mapping = dict(cfg.clean.column_mapping)
+        table = _apply_column_mapping(table, mapping, tournament_name)
+
+    # 2. Применяем типизацию (ВАЖНО: до dropna!)
+    if hasattr(cfg.clean, "dtype_mapping"):
+        table = _apply_dtype_conversion(table, cfg.clean.dtype_mapping, tournament_name)
+
+    # 3. Удаляем строки с NaN: одна объединённая маска и один проход filter
+    # вместо перематериализации таблицы на каждую колонку
+    drop_na_cols = [c for c in (cfg.clean.drop_na_columns or []) if c in table.column_names]
+    if drop_na_cols:
+        mask = reduce(pc.and_, (pc.is_valid(table[c]) for c in drop_na_cols))
+        table = table.filter(mask)
+
+    # 4. Выбираем нужные колонки
+    select_cols = cfg.clean.select_columns or []
+    if select_cols:
+        existing_cols = [c for c in select_cols if c in table.column_names]
+        if not existing_cols:
+            logger.warning(
+                "Турнир %s: ни одной из колонок %s нет в данных, пропускаю",
+                tournament_name,
+                select_cols,
+            )
+            return None
+        table = table.select(existing_cols)
+
+    return table
+
+
+def _write_buffered(
+    writer: pq.ParquetWriter | None,
+    tables: list[pa.Table],
+    out_path: Path,
+    stats_columns: list[str] | None = None,
+) -> pq.ParquetWriter:
+    """Записать накопленные батчи одной row-group, открыв writer при необходимости.
+
+    Args:
+        writer: Уже открытый writer или None (тогда откроется по схеме данных).
+        tables: Накопленные очищенные батчи.
+        out_path: Путь к выходному interim-файлу.
+        stats_columns: Колонки, для которых нужны min/max-статистики row-group
+            (ключи, по которым читатели могут отсекать группы). None — для всех.
+
+    Returns:
+        Открытый writer (для последующих записей и закрытия).
+    """
+    table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+    if writer is None:
+        # Статистики считаем только по ключевым колонкам: min/max-проход
+        # по остальным (строковым) колонкам читателями не используется
+        if stats_columns is not None:
+            write_statistics = [c for c in stats_columns if c in table.schema.names] or True
+        else:
+            write_statistics = True
+        # ZSTD даёт ~2x лучшее сжатие, чем snappy, при сравнимой скорости декода
+        writer = pq.ParquetWriter(
+            out_path,
+            table.schema,
+            compression="zstd",
+            compression_level=3,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+            write_statistics=write_statistics,
+        )
+    writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+    return writer
+
+
 def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
-    """Обработать один турнир: raw → interim.
+    """Обработать один турнир: raw → interim (потоково, батчами).
 
-    Читает parquet-файл из raw-слоя, применяет маппинг колонок,
-    выполняет типизацию, минимальную очистку согласно конфигу
-    и сохраняет результат в interim-слой.
+    Читает parquet-файл из raw-слоя батчами по ``BATCH_SIZE`` строк,
+    прогоняет каждый батч через конвейер очистки на уровне Arrow-таблицы
+    и инкрементально дописывает результат в interim-файл. Пиковая память
+    ограничена одним батчем, а чтение следующего батча перекрывается
+    с обработкой текущего.
 
     Args:
         tournament_dir: Путь к директории турнира в raw-слое.
@@ -247,88 +581,149 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
         logger.warning("Турнир %s: файл %s не найден, пропускаю", tournament_name, raw_path)
         return
 
+    interim_root = PROJECT_ROOT / cfg.paths.interim_dir
+    out_dir = interim_root / tournament_name
+    out_path = out_dir / "matches_interim.parquet"
+    stamp_path = out_dir / ".cfg_hash"
+
+    # Инкрементальность: если raw не менялся с момента записи interim
+    # и конфиг очистки тот же — переобрабатывать нечего
+    cfg_hash = hashlib.blake2b(OmegaConf.to_yaml(cfg.clean).encode()).hexdigest()[:16]
+    if (
+        out_path.exists()
+        and stamp_path.exists()
+        and raw_path.stat().st_mtime <= out_path.stat().st_mtime
+        and stamp_path.read_text() == cfg_hash
+    ):
+        logger.info(
+            "Турнир %s: interim актуален (raw и конфиг не менялись), пропускаю",
+            tournament_name,
+        )
+        return
+
     logger.info("Турнир %s: читаю raw %s", tournament_name, raw_path)
-    df: pd.DataFrame = pd.read_parquet(raw_path)
+    # memory_map: компрессированные страницы подтягиваются ядром лениво,
+    # без копии в user-space; pre_buffer коалесцирует чтения колонок
+    pf = pq.ParquetFile(raw_path, memory_map=True, pre_buffer=True)
 
-    if df is None or df.empty:
+    if pf.metadata.num_rows == 0:
         logger.warning("Турнир %s: пустой датафрейм, пропускаю", tournament_name)
         return
 
     logger.info(
         "Турнир %s: загружено %d записей, %d колонок",
         tournament_name,
-        len(df),
-        df.shape[1],
+        pf.metadata.num_rows,
+        pf.metadata.num_columns,
     )
 
-    # 1. Применяем маппинг колонок (если он задан в конфиге)
-    if hasattr(cfg.clean, "column_mapping") and cfg.clean.column_mapping:
-        mapping = dict(cfg.clean.column_mapping)
-        df = _apply_column_mapping(df, mapping, tournament_name)
+    read_columns = _resolve_read_columns(cfg, pf.schema_arrow.names, tournament_name)
 
-    # 2. Проверяем обязательные колонки (после маппинга!)
+    # Проверяем обязательные колонки по схеме (после маппинга!) до чтения данных
+    mapping = dict(getattr(cfg.clean, "column_mapping", None) or {})
+    projected_names = read_columns if read_columns is not None else pf.schema_arrow.names
+    mapped_names = [mapping.get(c, c) for c in projected_names]
     required = cfg.clean.required_columns or []
-    if required and not _validate_required_columns(df, required, tournament_name):
+    if required and not _validate_required_columns(mapped_names, required, tournament_name):
         return
 
-    # 3. Применяем типизацию (ВАЖНО: до dropna!)
-    if hasattr(cfg.clean, "dtype_mapping"):
-        df = _apply_dtype_conversion(df, cfg.clean.dtype_mapping, tournament_name)
-
-    # 4. Удаляем строки с NaN
-    drop_na_cols = cfg.clean.drop_na_columns or []
-    if drop_na_cols:
-        before = len(df)
-        df = df.dropna(subset=drop_na_cols)
-        after = len(df)
-        logger.info(
-            "Турнир %s: после dropna по %s осталось %d/%d записей",
-            tournament_name,
-            drop_na_cols,
-            after,
-            before,
-        )
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-    # 5. Выбираем нужные колонки
-    select_cols = cfg.clean.select_columns or []
-    if select_cols:
-        existing_cols = [c for c in select_cols if c in df.columns]
-        if not existing_cols:
-            logger.warning(
-                "Турнир %s: ни одной из колонок %s нет в данных, пропускаю",
-                tournament_name,
-                select_cols,
-            )
-            return
-        df = df[existing_cols]
-        logger.info(
-            "Турнир %s: оставлены колонки: %s",
-            tournament_name,
-            existing_cols,
-        )
+    # Пишем во временный файл: упавшая посередине обработка не должна
+    # оставить урезанный interim со свежим mtime — проверка актуальности
+    # выше сочла бы его валидным, и строки молча терялись бы
+    tmp_path = out_path.with_suffix(".parquet.tmp")
+
+    writer: pq.ParquetWriter | None = None
+    rows_read = 0
+    rows_written = 0
+    buffered: list[pa.Table] = []
+    buffered_rows = 0
+    completed = False
+
+    try:
+        # use_threads: поколоночное декодирование идёт параллельно
+        for batch in pf.iter_batches(
+            batch_size=BATCH_SIZE, columns=read_columns, use_threads=True
+        ):
+            rows_read += batch.num_rows
+            cleaned = _clean_table(pa.Table.from_batches([batch]), cfg, tournament_name)
+            if cleaned is None:
+                return
+            if cleaned.num_rows == 0:
+                continue
 
-    if df.empty:
+            # Копим батчи до целевого размера row-group, чтобы не плодить
+            # множество мелких групп по BATCH_SIZE строк
+            buffered.append(cleaned)
+            buffered_rows += cleaned.num_rows
+            rows_written += cleaned.num_rows
+
+            if buffered_rows >= ROW_GROUP_SIZE:
+                writer = _write_buffered(writer, buffered, tmp_path, stats_columns=list(required))
+                buffered = []
+                buffered_rows = 0
+
+        if buffered:
+            writer = _write_buffered(writer, buffered, tmp_path, stats_columns=list(required))
+        completed = True
+    finally:
+        if writer is not None:
+            writer.close()
+        if not completed:
+            tmp_path.unlink(missing_ok=True)
+
+    if rows_written == 0:
         logger.warning("Турнир %s: после очистки датафрейм пуст, пропускаю", tournament_name)
         return
 
-    # 6. Сохраняем результат
-    interim_root = PROJECT_ROOT / cfg.paths.interim_dir
-    out_dir = interim_root / tournament_name
-    out_dir.mkdir(parents=True, exist_ok=True)
-    out_path = out_dir / "matches_interim.parquet"
-
+    # Атомарная подмена в той же директории: interim либо прежний,
+    # либо целиком новый; штамп пишем только после подмены
+    tmp_path.replace(out_path)
+    stamp_path.write_text(cfg_hash)
     logger.info(
-        "Турнир %s: записываю interim (%d записей) → %s",
+        "Турнир %s: записан interim (%d/%d записей) → %s",
         tournament_name,
-        len(df),
+        rows_written,
+        rows_read,
         out_path,
     )
-    df.to_parquet(out_path, index=False)
+
+
+def _prefetch_raw_file(raw_path: Path) -> None:
+    """Подсказать ядру, что файл скоро понадобится (прогрев page cache).
+
+    Args:
+        raw_path: Путь к raw-файлу турнира; отсутствующий файл игнорируется.
+    """
+    try:
+        fd = os.open(raw_path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _process_tournament_worker(tournament_dir: Path, cfg_container: dict[str, Any]) -> None:
+    """Воркер пула процессов: восстановить DictConfig и обработать один турнир.
+
+    Args:
+        tournament_dir: Путь к директории турнира в raw-слое.
+        cfg_container: Конфиг в виде plain-словаря (DictConfig с интерполяциями
+            передавать между процессами нельзя, поэтому сериализуем контейнер).
+    """
+    process_tournament(tournament_dir, OmegaConf.create(cfg_container))
 
 
 @hydra.main(config_path="../../conf", config_name="data_clean", version_base="1.3")
 def run(cfg: DictConfig) -> None:
-    """Запустить обработку всех турниров из raw-слоя в interim-слой."""
+    """Запустить обработку всех турниров из raw-слоя в interim-слой.
+
+    Турниры независимы друг от друга (каждый читает и пишет свои файлы),
+    поэтому обрабатываются параллельно в пуле процессов.
+    """
     raw_root = PROJECT_ROOT / cfg.paths.raw_dir
     interim_root = PROJECT_ROOT / cfg.paths.interim_dir
 
@@ -337,14 +732,32 @@ def run(cfg: DictConfig) -> None:
 
     interim_root.mkdir(parents=True, exist_ok=True)
 
-    tournaments = sorted(p for p in raw_root.iterdir() if p.is_dir())
+    # os.scandir отдаёт тип записи из самого чтения каталога —
+    # один syscall на запись вместо iterdir + отдельного stat в is_dir()
+    with os.scandir(raw_root) as it:
+        tournaments = sorted(
+            (Path(entry.path) for entry in it if entry.is_dir()),
+            key=lambda p: p.name,
+        )
     if not tournaments:
         logger.warning("В %s нет ни одного турнира, ничего обрабатывать", raw_root)
         return
 
     logger.info("Найдено турниров в raw: %d", len(tournaments))
-    for tournament_dir in tournaments:
-        process_tournament(tournament_dir, cfg)
+
+    # Асинхронно прогреваем page cache: ядро начинает читать файлы с диска,
+    # пока пул процессов запускается и обрабатывает первые турниры
+    if hasattr(os, "posix_fadvise"):
+        for tournament_dir in tournaments:
+            _prefetch_raw_file(tournament_dir / "matches.parquet")
+
+    cfg_container = OmegaConf.to_container(cfg, resolve=True)
+    max_workers = min(len(tournaments), os.cpu_count() or 1)
+    logger.info("Обрабатываю турниры в %d процессах", max_workers)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # list() — чтобы дождаться всех воркеров и поднять их исключения
+        list(executor.map(_process_tournament_worker, tournaments, repeat(cfg_container)))
 
 
 if __name__ == "__main__":
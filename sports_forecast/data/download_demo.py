@@ -13,6 +13,7 @@
 from __future__ import annotations
 
 import argparse
+import shutil
 from pathlib import Path
 from urllib.parse import urlencode
 
@@ -24,6 +25,12 @@ from sports_forecast.utils.log_config import configure_logging, get_logger
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 logger = get_logger(__name__)
 
+#: Общая HTTP-сессия: переиспользует TCP/TLS-соединение между запросом
+#: к API Яндекс.Диска и самим скачиванием (экономит 1-2 RTT handshake'а
+#: на каждый запрос; пул — на случай многофайловых загрузок)
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
 
 def get_yandex_disk_download_url(public_url: str) -> str:
     """
@@ -43,7 +50,7 @@ def get_yandex_disk_download_url(public_url: str) -> str:
     params = {"public_key": public_url}
 
     logger.info("Получаю прямую ссылку для скачивания с Яндекс.Диска...")
-    response = requests.get(api_url + urlencode(params), timeout=30)
+    response = SESSION.get(api_url + urlencode(params), timeout=30)
     response.raise_for_status()
 
     response_data: dict[str, str] = response.json()
@@ -73,12 +80,13 @@ def download_file(url: str, dst: Path, is_yandex_disk: bool = False) -> None:
 
     logger.info("Скачиваю файл:\n  url=%s\n  → %s", url, dst)
 
-    with requests.get(url, stream=True, timeout=60) as resp:
+    with SESSION.get(url, stream=True, timeout=60) as resp:
         resp.raise_for_status()
-        with dst.open("wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        # Качаем мегабайтными кусками через copyfileobj: на порядки меньше
+        # итераций цикла и syscall'ов, чем при iter_content по 8 KiB
+        resp.raw.decode_content = True
+        with dst.open("wb", buffering=1 << 20) as f:
+            shutil.copyfileobj(resp.raw, f, length=1 << 20)
 
     size_kb = dst.stat().st_size / 1024
     logger.info("Файл загружен: %s (%.1f KB)", dst, size_kb)
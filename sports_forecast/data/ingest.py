@@ -33,9 +33,15 @@ Example:
 
 from __future__ import annotations
 
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyarrow import csv as pacsv
 
 from sports_forecast.utils.log_config import get_logger
 
@@ -52,6 +58,10 @@ DATA_RAW_DIR = PROJECT_ROOT / "data" / "raw"
 #: Логгер модуля для отслеживания процесса загрузки
 logger = get_logger(__name__)
 
+#: Целевой размер row group в выходном parquet (строк); крупные группы —
+#: меньше границ страниц и быстрее поколоночное чтение на clean-этапе
+ROW_GROUP_SIZE = 1_000_000
+
 
 def process_tournament(source_dir: Path, raw_root: Path) -> None:
     """Обработать один турнир: CSV → Parquet (ингест данных).
@@ -70,7 +80,7 @@ def process_tournament(source_dir: Path, raw_root: Path) -> None:
 
     Raises:
         FileNotFoundError: Если файл source.csv не найден (логируется warning).
-        pd.errors.ParserError: Если CSV файл имеет неверный формат.
+        pa.ArrowInvalid: Если CSV файл имеет неверный формат.
 
     Examples:
         >>> from pathlib import Path
@@ -81,89 +91,154 @@ def process_tournament(source_dir: Path, raw_root: Path) -> None:
     Note:
         Функция автоматически создает необходимые директории для выходных данных.
         Если файл source.csv отсутствует, турнир пропускается с предупреждением.
-        Все колонки сохраняются как строки для избежания проблем с типами.
+        Типы колонок выводятся Arrow-парсером; канонизация типов выполняется
+        на clean-этапе по dtype_mapping из конфига.
 
     Todo:
-        * Добавить валидацию схемы CSV
-        * Реализовать обработку ошибок парсинга
-        * Добавить поддержку сжатия Parquet файлов
         * Добавить автоопределение разделителя CSV
     """
     tournament_name = source_dir.name
     source_csv = source_dir / "source.csv"
     output_parquet = raw_root / tournament_name / "matches.parquet"
 
-    logger.info("=" * 60)
-    logger.info("НАЧАЛО ОБРАБОТКИ ТУРНИРА: %s", tournament_name)
-    logger.info("Ищу файл: %s", source_csv)
-    logger.info("Файл существует: %s", source_csv.exists())
-    logger.info("=" * 60)
+    logger.info("Обрабатываю турнир %s: источник %s", tournament_name, source_csv)
 
     if not source_csv.exists():
         logger.warning("Пропускаю турнир %s: файл %s отсутствует", tournament_name, source_csv)
         return
 
-    logger.info("Турнир %s: читаю %s", tournament_name, source_csv)
+    # Инкрементальный режим: если source.csv не менялся с прошлого запуска
+    # (размер + mtime в штампе), повторный парсинг не нужен — только stat-вызовы
+    src_stat = source_csv.stat()
+    stamp_key = f"{src_stat.st_size}:{src_stat.st_mtime_ns}"
+    stamp_path = output_parquet.with_suffix(".stamp")
+    try:
+        # Читаем штамп сразу: OSError покрывает и отсутствие файла,
+        # отдельный exists()-stat для штампа не нужен
+        up_to_date = output_parquet.exists() and stamp_path.read_text() == stamp_key
+    except OSError:
+        up_to_date = False
+    if up_to_date:
+        logger.info("Турнир %s: source.csv не изменился, пропускаю", tournament_name)
+        return
+
+    logger.debug("Турнир %s: читаю %s", tournament_name, source_csv)
+
+    # Пишем во временный файл и подменяем целевой parquet только после
+    # успешного закрытия writer'а: парсинг, упавший посреди потока (например,
+    # ArrowInvalid на блоке с «грязными» типами), не должен оставить
+    # урезанный файл, который clean-слой принял бы за данные
+    tmp_parquet = output_parquet.with_suffix(".parquet.tmp")
 
     try:
-        # Читаем CSV, сохраняя все колонки как строки для избежания проблем с типами
-        # low_memory=False для корректного определения типов во всем файле
-        df: pd.DataFrame = pd.read_csv(
-            source_csv,
-            dtype=str,  # Все колонки как строки
-            low_memory=False,
-        )
+        # Заголовок читаем отдельно — для ранней проверки на пустой файл
+        # и подсчёта колонок в логе
+        with source_csv.open(newline="", encoding="utf-8") as f:
+            try:
+                header = next(csv.reader(f))
+            except StopIteration:
+                logger.warning("Турнир %s: CSV файл пустой, пропускаю", tournament_name)
+                return
 
-        logger.info("Турнир %s: прочитано строк: %d", tournament_name, len(df))
-        logger.info("Турнир %s: колонок: %d", tournament_name, len(df.columns))
+        # Создаем директорию для выходного файла
+        logger.debug("Турнир %s: создаю директорию %s", tournament_name, output_parquet.parent)
+        output_parquet.parent.mkdir(parents=True, exist_ok=True)
 
-        if df.empty:
+        # Многопоточный SIMD-парсер Arrow вместо однопоточного парсера pandas;
+        # CSV стримится батчами сразу в parquet, пиковая память — O(block_size),
+        # а не O(размер файла), так что ингест переживает дампы больше RAM
+        # Типы выводит сам Arrow: числа и даты остаются нативными вместо
+        # тяжёлых строковых колонок; канонизацией типов занимается clean-слой
+        read_opts = pacsv.ReadOptions(use_threads=True, block_size=16 << 20)
+        convert_opts = pacsv.ConvertOptions(strings_can_be_null=True)
+
+        logger.debug("Турнир %s: сохраняю в %s", tournament_name, output_parquet)
+        rows_written = 0
+        writer: pq.ParquetWriter | None = None
+        buffered: list[pa.RecordBatch] = []
+        buffered_rows = 0
+
+        def _flush() -> None:
+            nonlocal buffered, buffered_rows
+            writer.write_table(
+                pa.Table.from_batches(buffered), row_group_size=ROW_GROUP_SIZE
+            )
+            buffered = []
+            buffered_rows = 0
+
+        try:
+            with pacsv.open_csv(
+                source_csv, read_options=read_opts, convert_options=convert_opts
+            ) as reader:
+                for batch in reader:
+                    if batch.num_rows == 0:
+                        continue
+                    if writer is None:
+                        # ZSTD даёт на 20-40% меньший файл, чем snappy, при
+                        # сопоставимой скорости декодирования на clean-слое;
+                        # словарное кодирование с крупными словарями и data page
+                        # v2 дополнительно ужимают строковые колонки
+                        writer = pq.ParquetWriter(
+                            tmp_parquet,
+                            reader.schema,
+                            compression="zstd",
+                            compression_level=3,
+                            use_dictionary=True,
+                            dictionary_pagesize_limit=4 << 20,
+                            data_page_version="2.0",
+                        )
+                    # Копим батчи до целевого row group, чтобы мелкие блоки
+                    # парсера не превращались в мелкие row group'ы на диске
+                    buffered.append(batch)
+                    buffered_rows += batch.num_rows
+                    rows_written += batch.num_rows
+                    if buffered_rows >= ROW_GROUP_SIZE:
+                        _flush()
+                if buffered:
+                    _flush()
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if rows_written == 0:
             logger.warning("Турнир %s: CSV файл пустой, пропускаю", tournament_name)
             return
 
+        # Атомарная подмена в той же директории: целевой файл либо прежний,
+        # либо целиком новый
+        tmp_parquet.replace(output_parquet)
+
         logger.info(
             "Турнир %s: загружено %d записей, %d колонок",
             tournament_name,
-            len(df),
-            len(df.columns),
+            rows_written,
+            len(header),
         )
 
-        # Создаем директорию для выходного файла
-        logger.info("Турнир %s: создаю директорию %s", tournament_name, output_parquet.parent)
-        output_parquet.parent.mkdir(parents=True, exist_ok=True)
-
-        # Сохраняем в Parquet с дополнительными параметрами
-        logger.info("Турнир %s: сохраняю в %s", tournament_name, output_parquet)
-        df.to_parquet(
-            output_parquet,
-            index=False,
-            engine="pyarrow",
-            compression="snappy",  # Сжатие для экономии места
-        )
+        # Фиксируем версию источника только после успешной записи parquet
+        stamp_path.write_text(stamp_key)
 
-        # Проверяем, что файл создан
-        if output_parquet.exists():
+        # Проверяем, что файл создан: один stat даёт и существование, и размер
+        try:
             file_size = output_parquet.stat().st_size
+        except FileNotFoundError:
+            logger.error("Турнир %s: ✗ parquet НЕ СОЗДАН → %s", tournament_name, output_parquet)
+        else:
             logger.info(
                 "Турнир %s: ✓ parquet создан → %s (размер: %.2f MB)",
                 tournament_name,
                 output_parquet,
                 file_size / (1024 * 1024),
             )
-        else:
-            logger.error("Турнир %s: ✗ parquet НЕ СОЗДАН → %s", tournament_name, output_parquet)
-
-    except pd.errors.ParserError as e:
-        logger.error("Турнир %s: ошибка парсинга CSV - %s", tournament_name, e)
-    except pd.errors.EmptyDataError as e:
-        logger.error("Турнир %s: CSV файл пустой или поврежден - %s", tournament_name, e)
-    except PermissionError as e:
-        logger.error("Турнир %s: нет прав на запись - %s", tournament_name, e)
-    except Exception as e:
-        logger.error("Турнир %s: неожиданная ошибка - %s", tournament_name, e)
-        import traceback
 
-        logger.error("Traceback:\n%s", traceback.format_exc())
+    except Exception:
+        # Единый обработчик: ошибки парсинга (pa.ArrowInvalid), прав доступа
+        # (OSError) и неожиданные — турнир пропускается, остальные не страдают.
+        # logger.exception форматирует traceback лениво, только если
+        # обработчик принимает ERROR
+        logger.exception("Турнир %s: ошибка обработки", tournament_name)
+        # finally выше финализировал writer — убираем урезанный временный файл
+        tmp_parquet.unlink(missing_ok=True)
 
 
 def run() -> None:
@@ -206,15 +281,27 @@ def run() -> None:
     if not DATA_SOURCE_DIR.exists():
         raise FileNotFoundError(f"Каталог с источниками не найден: {DATA_SOURCE_DIR}")
 
-    tournaments = sorted(p for p in DATA_SOURCE_DIR.iterdir() if p.is_dir())
+    # os.scandir использует d_type из dirent и не делает stat на каждую запись,
+    # в отличие от Path.iterdir() + is_dir()
+    with os.scandir(DATA_SOURCE_DIR) as it:
+        tournaments = sorted(
+            (Path(entry.path) for entry in it if entry.is_dir(follow_symlinks=False)),
+            key=lambda p: p.name,
+        )
     if not tournaments:
         logger.warning("В %s не найдено ни одного турнира", DATA_SOURCE_DIR)
         return
 
     logger.info("Найдено турниров: %d", len(tournaments))
 
-    for tournament_dir in tournaments:
-        process_tournament(tournament_dir, DATA_RAW_DIR)
+    # Турниры полностью независимы (каждый парсит свой CSV и пишет свой
+    # parquet), поэтому парсинг масштабируем по ядрам пулом процессов
+    max_workers = min(len(tournaments), os.cpu_count() or 1)
+    logger.info("Обрабатываю турниры в %d процессах", max_workers)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # list() — чтобы дождаться всех воркеров и поднять их исключения
+        list(executor.map(partial(process_tournament, raw_root=DATA_RAW_DIR), tournaments))
 
 
 if __name__ == "__main__":
@@ -28,11 +28,20 @@
 
 from __future__ import annotations
 
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
 from pathlib import Path
+from typing import Any
 
 import hydra
+import numpy as np
 import pandas as pd
-from omegaconf import DictConfig
+import pyarrow as pa
+import pyarrow.parquet as pq
+from omegaconf import DictConfig, OmegaConf
 
 from sports_forecast.utils.log_config import get_logger
 
@@ -41,6 +50,68 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 logger = get_logger(__name__)
 
 
+def _resolve_read_columns(cfg: DictConfig, schema_names: list[str]) -> list[str] | None:
+    """Вычислить минимальный набор interim-колонок, нужных пайплайну фичей.
+
+    Собирает колонки из конфига: мета-колонки, источники базовых фичей и
+    таргета, источники лагов, финальные колонки и колонку статуса. Parquet —
+    колоночный формат, поэтому проекция на этапе чтения избавляет от
+    декодирования неиспользуемых колонок.
+
+    Args:
+        cfg: Hydra-конфиг с параметрами генерации фичей.
+        schema_names: Имена колонок в interim-файле.
+
+    Returns:
+        Список колонок для чтения или None, если проекция невозможна
+        (нет конфига фичей или включён ``outputs.save_all``) — тогда
+        читаются все колонки.
+    """
+    # save_all сохраняет полный датасет (dataset.parquet) со всеми
+    # interim-колонками — проекция молча выкинула бы их из выхода
+    if bool(getattr(getattr(cfg, "outputs", {}), "save_all", False)):
+        return None
+
+    features_cfg = getattr(cfg, "features", None)
+    if features_cfg is None:
+        return None
+
+    needed: set[str] = set(getattr(features_cfg, "meta_columns", []) or [])
+
+    basic_cfg = getattr(features_cfg, "basic", None)
+    if basic_cfg is not None:
+        for section in ("diff", "total"):
+            section_cfg = getattr(basic_cfg, section, None)
+            if section_cfg is not None:
+                needed.add(section_cfg.home_column)
+                needed.add(section_cfg.away_column)
+
+    lag_cfg = getattr(features_cfg, "lag", None)
+    if lag_cfg is not None:
+        for section in ("diff", "total"):
+            section_cfg = getattr(lag_cfg, section, None)
+            if section_cfg is not None:
+                needed.add(section_cfg.source_column)
+
+    target_cfg = getattr(features_cfg, "target", None)
+    if target_cfg is not None:
+        needed.add(target_cfg.home_column)
+        needed.add(target_cfg.away_column)
+
+    needed.update(getattr(features_cfg, "final_columns", []) or [])
+
+    if hasattr(cfg, "split"):
+        needed.add(cfg.split.status_column)
+
+    if not needed:
+        return None
+
+    # Производные имена (например, источники лагов — это сами фичи)
+    # в interim отсутствуют; проецируем только существующие колонки
+    present = [name for name in schema_names if name in needed]
+    return present or None
+
+
 def _add_basic_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str) -> pd.DataFrame:
     """Добавить базовые фичи: разность и сумма очков.
 
@@ -61,6 +132,17 @@ def _add_basic_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str)
 
     basic_cfg = cfg.features.basic
 
+    # Кэш numpy-массивов: diff и total обычно считаются по одним и тем же
+    # колонкам, поэтому извлекаем их из датафрейма один раз и считаем
+    # обе фичи без выравнивания индексов pandas
+    col_cache: dict[str, np.ndarray] = {}
+
+    def _column_values(name: str) -> np.ndarray:
+        arr = col_cache.get(name)
+        if arr is None:
+            arr = col_cache[name] = df[name].to_numpy()
+        return arr
+
     # Разность очков (diff)
     if hasattr(basic_cfg, "diff"):
         diff_cfg = basic_cfg.diff
@@ -76,7 +158,7 @@ def _add_basic_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str)
                 away_col,
             )
         else:
-            df[diff_name] = df[home_col] - df[away_col]
+            df[diff_name] = np.subtract(_column_values(home_col), _column_values(away_col))
             logger.info(
                 "Турнир %s: создана фича разности '%s' = %s - %s",
                 tournament_name,
@@ -100,7 +182,7 @@ def _add_basic_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str)
                 away_col,
             )
         else:
-            df[total_name] = df[home_col] + df[away_col]
+            df[total_name] = np.add(_column_values(home_col), _column_values(away_col))
             logger.info(
                 "Турнир %s: создана фича суммы '%s' = %s + %s",
                 tournament_name,
@@ -132,44 +214,45 @@ def _add_lag_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str) -
 
     lag_cfg = cfg.features.lag
 
-    # Лаг разности очков
-    if hasattr(lag_cfg, "diff"):
-        diff_lag_cfg = lag_cfg.diff
-        src_col = diff_lag_cfg.source_column
-        new_col = diff_lag_cfg.new_column
-        periods = int(diff_lag_cfg.periods)
-
+    # Собираем спеки лагов (source, new, periods, fill_value),
+    # отбрасывая фичи с отсутствующими исходными колонками
+    specs: list[tuple[str, str, int, object]] = []
+    for section in ("diff", "total"):
+        if not hasattr(lag_cfg, section):
+            continue
+        section_cfg = getattr(lag_cfg, section)
+        src_col = section_cfg.source_column
         if src_col not in df.columns:
             logger.warning(
                 "Турнир %s: колонка для лаг-фичи '%s' не найдена, пропускаю",
                 tournament_name,
                 src_col,
             )
-        else:
-            df[new_col] = df[src_col].shift(periods)
-            logger.info(
-                "Турнир %s: создана лаг-фича '%s' = %s.shift(%d)",
-                tournament_name,
-                new_col,
+            continue
+        specs.append(
+            (
                 src_col,
-                periods,
+                section_cfg.new_column,
+                int(section_cfg.periods),
+                section_cfg.get("fill_value", 0),
             )
+        )
 
-    # Лаг суммы очков
-    if hasattr(lag_cfg, "total"):
-        total_lag_cfg = lag_cfg.total
-        src_col = total_lag_cfg.source_column
-        new_col = total_lag_cfg.new_column
-        periods = int(total_lag_cfg.periods)
-
-        if src_col not in df.columns:
-            logger.warning(
-                "Турнир %s: колонка для лаг-фичи '%s' не найдена, пропускаю",
-                tournament_name,
-                src_col,
-            )
-        else:
-            df[new_col] = df[src_col].shift(periods)
+    # Группируем по (periods, fill_value): один блочный shift по срезу
+    # датафрейма вместо отдельного shift на каждую фичу.
+    # fill_value вместо NaN в первых periods строках: без float64-апкаста
+    # и второго прохода на заполнение
+    groups: dict[tuple[int, object], list[tuple[str, str]]] = {}
+    for src_col, new_col, periods, fill_value in specs:
+        groups.setdefault((periods, fill_value), []).append((src_col, new_col))
+
+    for (periods, fill_value), cols in groups.items():
+        src_cols = [src for src, _ in cols]
+        new_cols = [new for _, new in cols]
+        shifted = df[src_cols].shift(periods, fill_value=fill_value)
+        shifted.columns = new_cols
+        df[new_cols] = shifted
+        for src_col, new_col in cols:
             logger.info(
                 "Турнир %s: создана лаг-фича '%s' = %s.shift(%d)",
                 tournament_name,
@@ -181,6 +264,129 @@ def _add_lag_features(df: pd.DataFrame, cfg: DictConfig, tournament_name: str) -
     return df
 
 
+@dataclass(frozen=True)
+class FeaturesPlan:
+    """Предвычисленный план фичей стандартной формы конфига.
+
+    Разрешается один раз за запуск (в ``run()``), чтобы воркеры не повторяли
+    hasattr/getattr-цепочки по DictConfig на каждый турнир: все обращения к
+    OmegaConf идут через ``__getattr__`` с резолвингом интерполяций.
+    """
+
+    home_col: str
+    away_col: str
+    diff_name: str
+    total_name: str
+    diff_lag_name: str
+    diff_lag_periods: int
+    diff_lag_fill: Any
+    total_lag_name: str
+    total_lag_periods: int
+    total_lag_fill: Any
+
+    @classmethod
+    def from_config(cls, cfg: DictConfig) -> FeaturesPlan | None:
+        """Собрать план из конфига или вернуть None для нестандартной формы.
+
+        Стандартная форма: diff и total по одним и тем же home/away колонкам,
+        лаги — поверх этих двух фичей. Всё остальное идёт по пошаговому пути.
+        """
+        features_cfg = getattr(cfg, "features", None)
+        if features_cfg is None:
+            return None
+        if not (hasattr(features_cfg, "basic") and hasattr(features_cfg, "lag")):
+            return None
+
+        basic_cfg = features_cfg.basic
+        lag_cfg = features_cfg.lag
+        if not (hasattr(basic_cfg, "diff") and hasattr(basic_cfg, "total")):
+            return None
+        if not (hasattr(lag_cfg, "diff") and hasattr(lag_cfg, "total")):
+            return None
+
+        diff_cfg = basic_cfg.diff
+        total_cfg = basic_cfg.total
+        home_col = diff_cfg.home_column
+        away_col = diff_cfg.away_column
+        if (total_cfg.home_column, total_cfg.away_column) != (home_col, away_col):
+            return None
+        if lag_cfg.diff.source_column != diff_cfg.name:
+            return None
+        if lag_cfg.total.source_column != total_cfg.name:
+            return None
+        # Срезовый лаг в fused-проходе корректен только для positive periods;
+        # вырожденные конфиги (0 — без сдвига, отрицательные — lead) отдаём
+        # пошаговому pandas shift, который их переживает
+        if int(lag_cfg.diff.periods) <= 0 or int(lag_cfg.total.periods) <= 0:
+            return None
+
+        return cls(
+            home_col=home_col,
+            away_col=away_col,
+            diff_name=diff_cfg.name,
+            total_name=total_cfg.name,
+            diff_lag_name=lag_cfg.diff.new_column,
+            diff_lag_periods=int(lag_cfg.diff.periods),
+            diff_lag_fill=lag_cfg.diff.get("fill_value", 0),
+            total_lag_name=lag_cfg.total.new_column,
+            total_lag_periods=int(lag_cfg.total.periods),
+            total_lag_fill=lag_cfg.total.get("fill_value", 0),
+        )
+
+
+def _build_features_fused(df: pd.DataFrame, plan: FeaturesPlan, tournament_name: str) -> bool:
+    """Посчитать базовые и лаговые фичи одним проходом по numpy-массивам.
+
+    План стандартной формы позволяет извлечь home/away один раз и записать
+    все четыре фичи без промежуточных Series и повторных чтений тех же байтов.
+
+    Args:
+        df: Датафрейм с данными турнира (фичи дописываются на месте).
+        plan: Предвычисленный план фичей.
+        tournament_name: Название турнира (для логирования).
+
+    Returns:
+        True, если фичи посчитаны; False — исходные колонки отсутствуют,
+        нужно идти по пошаговому пути (_add_basic_features + _add_lag_features).
+    """
+    if plan.home_col not in df.columns or plan.away_col not in df.columns:
+        return False
+
+    h = df[plan.home_col].to_numpy()
+    a = df[plan.away_col].to_numpy()
+    diff = np.subtract(h, a)
+    total = np.add(h, a)
+
+    n = len(df)
+
+    def _lag(src: np.ndarray, periods: int, fill_value: object) -> np.ndarray:
+        # Срезовое присваивание вместо concatenate: один memcpy в
+        # предвыделенный буфер, без промежуточных массивов и float-промоушена
+        out = np.empty_like(src)
+        out[: min(periods, n)] = fill_value
+        if periods < n:
+            out[periods:] = src[:-periods]
+        return out
+
+    diff_lag = _lag(diff, plan.diff_lag_periods, plan.diff_lag_fill)
+    total_lag = _lag(total, plan.total_lag_periods, plan.total_lag_fill)
+
+    df[plan.diff_name] = diff
+    df[plan.total_name] = total
+    df[plan.diff_lag_name] = diff_lag
+    df[plan.total_lag_name] = total_lag
+
+    logger.info(
+        "Турнир %s: фичи посчитаны одним проходом: %s, %s, %s, %s",
+        tournament_name,
+        plan.diff_name,
+        plan.total_name,
+        plan.diff_lag_name,
+        plan.total_lag_name,
+    )
+    return True
+
+
 def _add_target_column(df: pd.DataFrame, cfg: DictConfig, tournament_name: str) -> pd.DataFrame:
     """Добавить таргет-колонку: победа хозяев.
 
@@ -213,85 +419,68 @@ def _add_target_column(df: pd.DataFrame, cfg: DictConfig, tournament_name: str)
         )
         return df
 
-    # Таргет: 1 если хозяева выиграли, 0 иначе
-    df[target_name] = (df[home_col] > df[away_col]).astype(int)
+    # Таргет: 1 если хозяева выиграли, 0 иначе; uint8 вместо int64 —
+    # в 8 раз меньше памяти и байтов в parquet на эту колонку
+    target_arr = np.greater(df[home_col].to_numpy(), df[away_col].to_numpy()).view(np.uint8)
+    df[target_name] = target_arr
 
-    wins = df[target_name].sum()
-    total = len(df)
-    win_rate = (wins / total * 100) if total > 0 else 0
+    # Статистика побед — полный проход по колонке, считаем её только если
+    # INFO-лог вообще кого-то интересует
+    if logger.isEnabledFor(logging.INFO):
+        wins = int(target_arr.sum(dtype=np.int64))
+        total = len(df)
+        win_rate = (wins / total * 100) if total > 0 else 0
 
-    logger.info(
-        "Турнир %s: создан таргет '%s' (победа хозяев: %s > %s). Побед хозяев: %d/%d (%.1f%%)",
-        tournament_name,
-        target_name,
-        home_col,
-        away_col,
-        wins,
-        total,
-        win_rate,
-    )
+        logger.info(
+            "Турнир %s: создан таргет '%s' (победа хозяев: %s > %s). Побед хозяев: %d/%d (%.1f%%)",
+            tournament_name,
+            target_name,
+            home_col,
+            away_col,
+            wins,
+            total,
+            win_rate,
+        )
 
     return df
 
 
-def _select_final_columns(
-    df: pd.DataFrame,
-    cfg: DictConfig,
-    tournament_name: str,
-    *,
-    include_target: bool,
-) -> pd.DataFrame:
-    """Выбрать колонки для финального датасета (meta + features [+ target]).
+def _final_column_plan(
+    cfg: DictConfig, available: set[str], tournament_name: str
+) -> tuple[list[str], str | None]:
+    """Собрать финальные колонки (meta + features) один раз на турнир.
+
+    Наборы колонок у train и inference общие, различие — только таргет,
+    поэтому членство в df.columns проверяется один раз, а не на каждый сплит.
 
     Args:
-        df: Датафрейм с подготовленными фичами.
         cfg: Hydra-конфиг с параметрами финальных колонок.
+        available: Колонки датафрейма после генерации фичей.
         tournament_name: Название турнира (для логирования).
-        include_target: Добавлять ли таргет в итоговый набор (True для train, False для inference).
 
     Returns:
-        Датафрейм с только необходимыми колонками.
+        Пара (base_cols, target_name): существующие финальные колонки без
+        таргета и имя таргета из конфига (None, если таргет не настроен).
     """
     features_cfg = getattr(cfg, "features", {})
 
     meta_cols = list(getattr(features_cfg, "meta_columns", []) or [])
     feature_cols = list(getattr(features_cfg, "final_columns", []) or [])
-
-    cols: list[str] = []
-    cols.extend(meta_cols)
-    cols.extend(feature_cols)
+    cols = meta_cols + feature_cols
 
     target_name: str | None = None
-    if include_target and hasattr(features_cfg, "target"):
+    if hasattr(features_cfg, "target"):
         target_name = features_cfg.target.name
-        cols.append(target_name)
-
-    available_cols = [c for c in cols if c in df.columns]
 
-    if len(available_cols) != len(cols):
-        missing = set(cols) - set(df.columns)
+    base_cols = [c for c in cols if c in available]
+    if len(base_cols) != len(cols):
         logger.warning(
             "Турнир %s: не все финальные колонки найдены, отсутствуют %s",
             tournament_name,
-            missing,
+            set(cols) - available,
         )
 
-    if not available_cols:
-        logger.warning(
-            "Турнир %s: не найдено ни одной финальной колонки, возвращаю исходный датафрейм",
-            tournament_name,
-        )
-        return df
-
-    df_final = df[available_cols].copy()
-    logger.info(
-        "Турнир %s: выбраны финальные колонки (%d): %s",
-        tournament_name,
-        len(available_cols),
-        ", ".join(available_cols),
-    )
-
-    return df_final
+    return base_cols, target_name
 
 
 def _split_by_status(
@@ -314,10 +503,27 @@ def _split_by_status(
         )
         return df.iloc[0:0].copy(), df.iloc[0:0].copy()
 
+    # Статусы сравниваем по целочисленным кодам категорий: SIMD-сравнение
+    # int8 вместо построчного сравнения строк. Выборку делаем через take —
+    # одна материализация строк вместо "маска + полный .copy()", и при этом
+    # результату можно безопасно назначать новые колонки (таргет)
+    cat = pd.Categorical(df[status_col])
+    codes = np.asarray(cat.codes)
+    categories = cat.categories
+
+    def _code_of(status: str) -> int:
+        loc = int(categories.get_indexer([status])[0])
+        # -1 зарезервирован под NaN-коды; отсутствующий статус не должен
+        # случайно совпасть с пропусками
+        return loc if loc >= 0 else -2
+
     drop_statuses = set(cfg.split.get("drop_statuses", []) or [])
     if drop_statuses:
         before = len(df)
-        df = df[~df[status_col].isin(drop_statuses)].copy()
+        drop_codes = [code for code in map(_code_of, drop_statuses) if code >= 0]
+        keep = ~np.isin(codes, drop_codes)
+        df = df.take(np.flatnonzero(keep))
+        codes = codes[keep]
         logger.info(
             "Турнир %s: отброшено по статусам %s: %d строк",
             tournament_name,
@@ -328,8 +534,8 @@ def _split_by_status(
     train_status = cfg.split.train_status
     inference_status = cfg.split.inference_status
 
-    train_df = df[df[status_col] == train_status].copy()
-    inference_df = df[df[status_col] == inference_status].copy()
+    train_df = df.take(np.flatnonzero(codes == _code_of(train_status)))
+    inference_df = df.take(np.flatnonzero(codes == _code_of(inference_status)))
 
     logger.info(
         "Турнир %s: split по '%s': train=%d (%s), inference=%d (%s)",
@@ -356,13 +562,38 @@ def _drop_target_for_inference(
     return df
 
 
-def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
+def _write_parquet(df: pd.DataFrame, path: Path) -> None:
+    """Записать processed-датафрейм в parquet с настроенным кодированием.
+
+    ZSTD уровня 1 + словарное кодирование + data page v2: финальные колонки —
+    в основном небольшие целые, словарь и RLE ужимают их в разы сильнее
+    дефолтного snappy. Один row group на файл — датасеты небольшие,
+    а чтение колонок ниже по пайплайну становится дешевле.
+    """
+    pq.write_table(
+        pa.Table.from_pandas(df, preserve_index=False),
+        path,
+        compression="zstd",
+        compression_level=1,
+        use_dictionary=True,
+        data_page_version="2.0",
+        row_group_size=max(len(df), 1),
+    )
+
+
+def process_tournament(
+    tournament_dir: Path, cfg: DictConfig, plan: FeaturesPlan | None = None
+) -> None:
     """Обработать один турнир: interim → processed.
 
     Args:
         tournament_dir: Путь к директории турнира в interim-слое.
         cfg: Hydra-конфиг с параметрами генерации фичей.
+        plan: Предвычисленный план фичей (None — разрешить из cfg).
     """
+    if plan is None:
+        plan = FeaturesPlan.from_config(cfg)
+
     tournament_name = tournament_dir.name
     interim_path = tournament_dir / "matches_interim.parquet"
 
@@ -371,12 +602,33 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
         return
 
     logger.info("Турнир %s: читаю interim %s", tournament_name, interim_path)
-    df: pd.DataFrame = pd.read_parquet(interim_path)
+    # Проекция колонок на этапе чтения: не декодируем то, что пайплайну
+    # не нужно; self_destruct освобождает Arrow-буферы по ходу конвертации
+    read_columns = _resolve_read_columns(cfg, pq.read_schema(interim_path).names)
+    table = pq.read_table(interim_path, columns=read_columns, use_threads=True)
+    df: pd.DataFrame = table.to_pandas(self_destruct=True)
+    del table
 
     if df is None or df.empty:
         logger.warning("Турнир %s: пустой датафрейм interim, пропускаю", tournament_name)
         return
 
+    # Сужаем числовые исходники сразу после чтения: очки влезают в int16
+    # (float32 — если остались дробные/NaN), и все последующие операции
+    # (diff/total/лаги/таргет) гоняют в 2-8 раз меньше байтов через кэш
+    if plan is not None:
+        for col in (plan.home_col, plan.away_col):
+            if col not in df.columns:
+                continue
+            series = pd.to_numeric(df[col], downcast="integer")
+            if series.dtype.kind == "f":
+                series = pd.to_numeric(series, downcast="float")
+            elif series.dtype.itemsize < 2:
+                # Ниже int16 не сужаем: сумма двух очков легко превышает
+                # 127, и total в int8 молча переполнялся бы
+                series = series.astype(np.int16)
+            df[col] = series
+
     logger.info(
         "Турнир %s: загружено %d записей, %d колонок",
         tournament_name,
@@ -384,11 +636,14 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
         df.shape[1],
     )
 
-    # Добавляем базовые фичи (разность и сумма)
-    df = _add_basic_features(df, cfg, tournament_name)
+    # Фичи стандартной формы считаем одним numpy-проходом; нестандартный
+    # конфиг идёт по пошаговому пути
+    if plan is None or not _build_features_fused(df, plan, tournament_name):
+        # Добавляем базовые фичи (разность и сумма)
+        df = _add_basic_features(df, cfg, tournament_name)
 
-    # Добавляем лаговые фичи
-    df = _add_lag_features(df, cfg, tournament_name)
+        # Добавляем лаговые фичи
+        df = _add_lag_features(df, cfg, tournament_name)
 
     # Делим на train/inference до финальной селекции
     train_df, inference_df = _split_by_status(df, cfg, tournament_name)
@@ -399,16 +654,29 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
     # На всякий случай гарантируем, что в inference таргета нет
     inference_df = _drop_target_for_inference(inference_df, cfg, tournament_name)
 
-    # Финальная селекция колонок:
+    # Финальная селекция колонок (план считаем один раз на турнир):
     # - train: meta + features + target
     # - inference: meta + features (без таргета)
-    train_df = _select_final_columns(train_df, cfg, tournament_name, include_target=True)
-    inference_df = _select_final_columns(
-        inference_df,
-        cfg,
-        tournament_name,
-        include_target=False,
-    )
+    base_cols, target_name = _final_column_plan(cfg, set(df.columns), tournament_name)
+    if base_cols:
+        train_cols = list(base_cols)
+        if target_name is not None and target_name in train_df.columns:
+            train_cols.append(target_name)
+        # reindex по уже отфильтрованным колонкам переиспользует существующие
+        # блоки без полного memcpy: дальше срезы только пишутся в parquet
+        train_df = train_df.reindex(columns=train_cols)
+        inference_df = inference_df.reindex(columns=base_cols)
+        logger.info(
+            "Турнир %s: выбраны финальные колонки (%d): %s",
+            tournament_name,
+            len(train_cols),
+            ", ".join(train_cols),
+        )
+    else:
+        logger.warning(
+            "Турнир %s: не найдено ни одной финальной колонки, оставляю все колонки",
+            tournament_name,
+        )
 
     # Сохраняем результат
     processed_root = PROJECT_ROOT / cfg.paths.processed_dir
@@ -432,7 +700,7 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
             train_df.shape[1],
             train_path,
         )
-        train_df.to_parquet(train_path, index=False)
+        _write_parquet(train_df, train_path)
     else:
         logger.warning("Турнир %s: train пустой, файл не записан", tournament_name)
 
@@ -444,7 +712,7 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
             inference_df.shape[1],
             inf_path,
         )
-        inference_df.to_parquet(inf_path, index=False)
+        _write_parquet(inference_df, inf_path)
     else:
         logger.warning("Турнир %s: inference пустой, файл не записан", tournament_name)
 
@@ -457,7 +725,19 @@ def process_tournament(tournament_dir: Path, cfg: DictConfig) -> None:
             df.shape[1],
             all_path,
         )
-        df.to_parquet(all_path, index=False)
+        _write_parquet(df, all_path)
+
+
+def _process_tournament_worker(
+    tournament_dir: Path, cfg_container: dict[str, Any], plan: FeaturesPlan | None
+) -> None:
+    """Воркер пула процессов: восстановить DictConfig и обработать турнир.
+
+    DictConfig не дружит с pickle, поэтому между процессами конфиг ездит
+    как plain-контейнер и собирается обратно уже в воркере; frozen-план
+    пиклится как есть.
+    """
+    process_tournament(tournament_dir, OmegaConf.create(cfg_container), plan)
 
 
 @hydra.main(config_path="../../conf", config_name="features_basic", version_base="1.3")
@@ -477,8 +757,23 @@ def run(cfg: DictConfig) -> None:
         return
 
     logger.info("Найдено турниров в interim: %d", len(tournaments))
-    for tournament_dir in tournaments:
-        process_tournament(tournament_dir, cfg)
+
+    # Турниры независимы (каждый читает и пишет свои файлы) —
+    # масштабируем по ядрам пулом процессов, как на ingest/clean-этапах.
+    # num_workers в конфиге позволяет ограничить пул вручную
+    max_workers = int(cfg.get("num_workers") or 0) or min(len(tournaments), os.cpu_count() or 1)
+    logger.info("Обрабатываю турниры в %d процессах", max_workers)
+
+    cfg_container = OmegaConf.to_container(cfg, resolve=True)
+    # План фичей разрешаем один раз на весь запуск, а не в каждом воркере
+    plan = FeaturesPlan.from_config(cfg)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # list() — чтобы дождаться всех воркеров и поднять их исключения
+        list(
+            executor.map(
+                _process_tournament_worker, tournaments, repeat(cfg_container), repeat(plan)
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -14,19 +14,48 @@
 
 from __future__ import annotations
 
+import functools
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import hydra
+import numpy as np
 import pandas as pd
-from catboost import CatBoostClassifier
+import pyarrow as pa
+import pyarrow.dataset as pads
+import pyarrow.parquet as pq
 from omegaconf import DictConfig
+from pyarrow import feather
+
+if TYPE_CHECKING:
+    from catboost import CatBoostClassifier
 
 from sports_forecast.utils.log_config import configure_logging, get_logger
+from sports_forecast.utils.row_filter import build_row_filter
 
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
 logger = get_logger(__name__)
 
+#: Размер батча (строк) при инференсе и при записи предсказаний:
+#: ограничивает пик памяти и даёт читателям min/max-статистики по row group'ам
+BATCH_SIZE = 65_536
+
+
+@functools.cache
+def _project_root() -> Path:
+    """Корень проекта. ``resolve()`` статит каждый компонент пути — кэшируем."""
+    return Path(__file__).resolve().parents[1]
+
+
+def _gpu_available() -> bool:
+    """Проверить, видит ли CatBoost хотя бы одно CUDA-устройство."""
+    try:
+        from catboost.utils import get_gpu_device_count
+
+        return get_gpu_device_count() > 0
+    except Exception:
+        return False
+
 
 def load_inference_dataset(
     processed_root: Path,
@@ -36,12 +65,61 @@ def load_inference_dataset(
     filename = cfg.data.inference_filename
     dataset_path = processed_root / tournament / filename
 
-    if not dataset_path.exists():
-        logger.error("Inference-датасет не найден: %s", dataset_path)
-        return None
-
     logger.info("Читаю inference-датасет: %s", dataset_path)
-    df = pd.read_parquet(dataset_path)
+    row_filter = build_row_filter(cfg.data.get("row_filter"))
+
+    # Проекция колонок: фичи + идентификаторы из inference.keep_columns.
+    # Parquet-ридер тогда вообще не декодирует остальные колонки. Если
+    # keep_columns не задан, читаем всё — датасет целиком уходит в выход
+    keep = cfg.inference.get("keep_columns")
+    columns: list[str] | None = None
+    if keep is not None:
+        columns = list(dict.fromkeys([*keep, *cfg.inference.feature_columns]))
+
+    # Feather-кэш хранит колонки в готовой IPC-раскладке: повторные запуски
+    # не платят за декомпрессию и декодирование parquet. Кэш только без
+    # фильтра строк — инвалидация идёт лишь по mtime источника
+    use_cache = bool(cfg.data.get("feather_cache", False)) and row_filter is None
+    cache_path = dataset_path.with_suffix(".feather")
+    table = None
+    if use_cache:
+        try:
+            if cache_path.stat().st_mtime_ns >= dataset_path.stat().st_mtime_ns:
+                table = feather.read_table(cache_path)
+        except OSError:
+            table = None
+        if table is not None:
+            # Кэш мог быть записан с другой проекцией keep_columns —
+            # используем его, только если все нужные колонки на месте.
+            # При columns=None «нужные» — все колонки исходного parquet
+            try:
+                needed = columns if columns is not None else pq.read_schema(dataset_path).names
+            except OSError:
+                needed = None
+            if needed is None or not set(needed) <= set(table.column_names):
+                table = None
+            elif columns is not None:
+                table = table.select(columns)
+        if table is not None:
+            logger.info("Использую feather-кэш: %s", cache_path)
+
+    if table is None:
+        # Читаем напрямую через pyarrow; опциональный data.row_filter
+        # отсекает row group'ы по статистикам футера. Открываем без
+        # предварительного exists() — экономит stat на каждый запуск
+        try:
+            dataset = pads.dataset(dataset_path, format="parquet")
+        except FileNotFoundError:
+            logger.error("Inference-датасет не найден: %s", dataset_path)
+            return None
+        table = dataset.to_table(columns=columns, filter=row_filter)
+        if use_cache:
+            feather.write_feather(table, cache_path, compression="lz4")
+
+    # split_blocks + self_destruct: поколоночные блоки без консолидации,
+    # Arrow-буферы освобождаются по ходу конвертации
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
 
     if df is None or df.empty:
         logger.warning("Inference-датасет пустой")
@@ -61,6 +139,10 @@ def load_model(models_root: Path, cfg: DictConfig) -> CatBoostClassifier:
         raise FileNotFoundError(f"Файл модели не найден: {model_path}")
 
     logger.info("Загружаю модель CatBoost: %s", model_path)
+    # catboost импортируем лениво: --help и ранние выходы не платят
+    # за загрузку нативной библиотеки
+    from catboost import CatBoostClassifier
+
     model = CatBoostClassifier()
     model.load_model(str(model_path))
     return model
@@ -71,9 +153,9 @@ def run(cfg: DictConfig) -> None:
     configure_logging(level=cfg.logging.level)
     logger.info("Predict (CatBoost) config: %s", cfg)
 
-    processed_root = PROJECT_ROOT / cfg.paths.processed_dir
-    predictions_root = PROJECT_ROOT / cfg.paths.predictions_dir
-    models_root = PROJECT_ROOT / cfg.paths.models_dir
+    processed_root = _project_root() / cfg.paths.processed_dir
+    predictions_root = _project_root() / cfg.paths.predictions_dir
+    models_root = _project_root() / cfg.paths.models_dir
 
     predictions_root.mkdir(parents=True, exist_ok=True)
 
@@ -95,13 +177,46 @@ def run(cfg: DictConfig) -> None:
 
     model = load_model(models_root, cfg)
 
+    from catboost import Pool
+
     logger.info("Считаю predict_proba...")
-    proba = model.predict_proba(X)[:, 1]
+    # CatBoost оптимизирован под float32: конвертируем фичи один раз сами,
+    # иначе predict скопирует и транспонирует датафрейм внутри. Считаем
+    # батчами в предвыделенный буфер — пик памяти не растёт с датасетом,
+    # и храним сразу только вероятность класса 1
+    X_np = np.asfortranarray(X.to_numpy(dtype=np.float32))
+    del X
+
+    n_rows = len(X_np)
+    proba = np.empty(n_rows, dtype=np.float32)
+
+    # GPU-скоринг окупается только на больших батчах: ниже порога накладные
+    # расходы на запуск ядер делают CPU быстрее. Включается явно в конфиге
+    use_gpu = (
+        bool(cfg.inference.get("gpu_predict", False))
+        and n_rows >= int(cfg.inference.get("gpu_min_rows", 200_000))
+        and _gpu_available()
+    )
+    if use_gpu:
+        # Одним вызовом без разбиения: дробление на батчи съело бы
+        # пропускную способность GPU
+        logger.info("Инференс на GPU (%d строк)", n_rows)
+        pool = Pool(X_np, feature_names=feature_columns)
+        proba[:] = model.predict(pool, prediction_type="Probability", task_type="GPU")[:, 1]
+    else:
+        logger.info("Инференс на CPU батчами по %d строк", BATCH_SIZE)
+        for start in range(0, n_rows, BATCH_SIZE):
+            pool = Pool(X_np[start : start + BATCH_SIZE], feature_names=feature_columns)
+            proba[start : start + BATCH_SIZE] = model.predict(
+                pool, prediction_type="Probability", thread_count=-1
+            )[:, 1]
 
     proba_col = cfg.inference.get("proba_column", "proba_home_win")
 
-    df_out = df.copy()
-    df_out[proba_col] = proba
+    # Дописываем предсказания прямо в df: исходный датафрейм дальше не
+    # используется, а .copy() удваивал пиковую память инференса.
+    # float32 — вдвое меньше байтов в памяти и в parquet
+    df[proba_col] = proba
 
     tournament = cfg.data.tournament
     out_dir = predictions_root / tournament
@@ -110,11 +225,29 @@ def run(cfg: DictConfig) -> None:
     out_path = out_dir / "predictions.parquet"
     logger.info(
         "Записываю предсказания (%d строк, %d колонок) → %s",
-        len(df_out),
-        df_out.shape[1],
+        len(df),
+        df.shape[1],
         out_path,
     )
-    df_out.to_parquet(out_path, index=False)
+    # Стримим запись по батчам: Arrow-таблица строится кусками, а не целиком,
+    # и каждый батч становится row group'ом со своими статистиками.
+    # Схему выводим по первой строке: по пустой выборке object-колонки
+    # (например, статус) выводились бы как null и ломали конвертацию.
+    # safe=False выключает повторные проверки переполнения при
+    # конвертации каждого батча — типы зафиксированы схемой
+    schema = pa.Schema.from_pandas(df.iloc[:1], preserve_index=False)
+    with pq.ParquetWriter(
+        out_path,
+        schema,
+        compression="zstd",
+        use_dictionary=True,
+        data_page_size=1 << 20,
+    ) as writer:
+        for start in range(0, len(df), BATCH_SIZE):
+            chunk = df.iloc[start : start + BATCH_SIZE]
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema=schema, preserve_index=False, safe=False)
+            )
 
 
 if __name__ == "__main__":
@@ -14,57 +14,189 @@
 
 from __future__ import annotations
 
+import functools
+import logging
+import tempfile
+import time
 from pathlib import Path
 
 import hydra
-import mlflow
-import mlflow.catboost
+import numpy as np
 import pandas as pd
-from catboost import CatBoostClassifier
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pads
 from omegaconf import DictConfig, OmegaConf
-from sklearn.metrics import roc_auc_score
-from sklearn.model_selection import train_test_split
+from pyarrow import feather
 
 from sports_forecast.utils.log_config import configure_logging, get_logger
+from sports_forecast.utils.row_filter import build_row_filter
 
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
 logger = get_logger(__name__)
 
 
+@functools.cache
+def _project_root() -> Path:
+    """Корень проекта. ``resolve()`` статит каждый компонент пути — кэшируем."""
+    return Path(__file__).resolve().parents[1]
+
+
+def _log_pyfunc_model(model_path: Path) -> None:
+    """Залогировать модель в MLflow как pyfunc поверх уже сохранённого ``.cbm``.
+
+    Артефактом становится готовый файл с диска — без повторной сериализации
+    бустера, которую делал бы ``mlflow.catboost.log_model``.
+    """
+    import mlflow.pyfunc
+
+    class _CatBoostPyfuncWrapper(mlflow.pyfunc.PythonModel):
+        def load_context(self, context):
+            from catboost import CatBoostClassifier
+
+            model = CatBoostClassifier()
+            model.load_model(context.artifacts["model"])
+            self._model = model
+
+        def predict(self, context, model_input, params=None):
+            return self._model.predict_proba(model_input)[:, 1]
+
+    mlflow.pyfunc.log_model(
+        artifact_path="model",
+        python_model=_CatBoostPyfuncWrapper(),
+        artifacts={"model": str(model_path)},
+    )
+
+
+def _gpu_available() -> bool:
+    """Проверить, видит ли CatBoost хотя бы одно CUDA-устройство."""
+    try:
+        from catboost.utils import get_gpu_device_count
+
+        return get_gpu_device_count() > 0
+    except Exception:
+        return False
+
+
+def _resolve_model_params(model_cfg: dict) -> dict:
+    """Разрешить гиперпараметры модели с авто-выбором устройства.
+
+    Построение деревьев — основная вычислительная нагрузка пайплайна,
+    на GPU оно на порядок быстрее. Если task_type не задан в конфиге явно,
+    выбираем GPU при наличии CUDA-устройства, иначе CPU. Параметры,
+    не поддерживаемые GPU-бэкендом, вычищаются/переименовываются.
+    """
+    params = dict(model_cfg.get("params") or {})
+
+    if params.get("task_type") is None:
+        if _gpu_available():
+            params["task_type"] = "GPU"
+            params.setdefault("devices", "0")
+        else:
+            params["task_type"] = "CPU"
+
+    if params["task_type"] == "GPU":
+        # thread_count не поддерживается на GPU; colsample_bylevel зовётся rsm
+        params.pop("thread_count", None)
+        if "colsample_bylevel" in params:
+            params["rsm"] = params.pop("colsample_bylevel")
+        # Дефолтные 254 бордера квантизации упираются в пропускную
+        # способность памяти GPU; 32 бинов почти не теряют качество и
+        # заметно быстрее. max_bin — алиас border_count, уважаем оба
+        if "border_count" not in params and "max_bin" not in params:
+            params["border_count"] = 32
+
+    return params
+
+
+def _read_feather_cache(cache_path: Path, source_path: Path, needed: list[str]) -> pa.Table | None:
+    """Прочитать feather-кэш, если он свежее источника и содержит нужные колонки.
+
+    Feather/IPC сохраняет колоночную раскладку как есть, поэтому повторные
+    запуски не платят за zstd-декомпрессию и декодирование словарей parquet.
+    """
+    try:
+        if cache_path.stat().st_mtime_ns < source_path.stat().st_mtime_ns:
+            return None
+        table = feather.read_table(cache_path)
+    except OSError:
+        return None
+
+    if not set(needed) <= set(table.column_names):
+        return None
+
+    logger.info("Использую feather-кэш: %s", cache_path)
+    return table.select(needed)
+
+
 def load_dataset(
     processed_root: Path,
     tournament: str,
     dataset_filename: str,
     target_column: str,
     feature_columns: list[str],
+    row_filter: pc.Expression | None = None,
+    feather_cache: bool = False,
 ) -> tuple[pd.DataFrame, pd.Series] | None:
     dataset_path = processed_root / tournament / dataset_filename
-    if not dataset_path.exists():
-        logger.error("Файл датасета не найден: %s", dataset_path)
-        return None
-
     logger.info("Читаю датасет: %s", dataset_path)
-    df = pd.read_parquet(dataset_path)
 
-    if df is None or df.empty:
-        logger.error("Датасет пустой")
+    # Проверяем наличие колонок по схеме parquet (без чтения данных)
+    # и читаем только нужные: фичи + таргет. Открываем сразу, без
+    # предварительного exists() — экономит stat на каждый запуск
+    try:
+        dataset = pads.dataset(dataset_path, format="parquet")
+    except FileNotFoundError:
+        logger.error("Файл датасета не найден: %s", dataset_path)
         return None
-
-    if target_column not in df.columns:
-        logger.error("Таргет '%s' отсутствует. Колонки: %s", target_column, list(df.columns))
+    schema_names = dataset.schema.names
+    if target_column not in schema_names:
+        logger.error("Таргет '%s' отсутствует. Колонки: %s", target_column, schema_names)
         return None
 
-    missing = [c for c in feature_columns if c not in df.columns]
+    missing = [c for c in feature_columns if c not in schema_names]
     if missing:
-        logger.error("Отсутствуют фичи из конфига: %s. Колонки: %s", missing, list(df.columns))
+        logger.error("Отсутствуют фичи из конфига: %s. Колонки: %s", missing, schema_names)
+        return None
+
+    needed = [*feature_columns, target_column]
+
+    # Кэш имеет смысл только без фильтра строк: фильтр меняет содержимое,
+    # а инвалидация кэша идёт лишь по mtime источника
+    use_cache = feather_cache and row_filter is None
+    cache_path = dataset_path.with_suffix(".feather")
+    table = _read_feather_cache(cache_path, dataset_path, needed) if use_cache else None
+
+    if table is None:
+        # filter отсекает row group'ы по статистикам футера до чтения данных
+        table = dataset.to_table(columns=needed, filter=row_filter)
+        if use_cache:
+            feather.write_feather(table, cache_path, compression="lz4")
+    # split_blocks + self_destruct: поколоночные блоки без общей консолидации,
+    # Arrow-буферы освобождаются по ходу конвертации
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+
+    if df.empty:
+        logger.error("Датасет пустой")
         return None
 
     X = df[feature_columns]
     y = df[target_column]
 
     logger.info("X shape: %s | y shape: %s", X.shape, y.shape)
-    logger.info("Target distribution:\n%s", y.value_counts(dropna=False))
+    if logger.isEnabledFor(logging.DEBUG):
+        # Диагностика распределения таргета: bincount по целочисленному
+        # массиву на порядки дешевле value_counts, для прочих типов
+        # хватает np.unique
+        y_np = y.to_numpy()
+        if np.issubdtype(y_np.dtype, np.integer):
+            counts = np.bincount(y_np.astype(np.int64, copy=False))
+            dist = {value: int(count) for value, count in enumerate(counts) if count}
+        else:
+            values, counts = np.unique(y_np, return_counts=True)
+            dist = dict(zip(values.tolist(), counts.tolist()))
+        logger.debug("Target distribution: %s", dist)
 
     return X, y
 
@@ -74,16 +206,25 @@ def run(cfg: DictConfig) -> None:
     configure_logging(level=cfg.logging.level)
     logger.info("Train (CatBoost) config: %s", cfg)
 
-    processed_root = PROJECT_ROOT / cfg.paths.processed_dir
-    models_root = PROJECT_ROOT / cfg.paths.models_dir
+    # Конфиг конвертируем в обычные dict один раз: каждый доступ через
+    # OmegaConf-ноду заново ходит по дереву и резолвит интерполяции
+    conf = OmegaConf.to_container(cfg, resolve=True)
+    data_cfg = conf["data"]
+    training_cfg = conf["training"]
+    model_cfg = conf["model"]
+
+    processed_root = _project_root() / conf["paths"]["processed_dir"]
+    models_root = _project_root() / conf["paths"]["models_dir"]
     models_root.mkdir(parents=True, exist_ok=True)
 
     dataset = load_dataset(
         processed_root=processed_root,
-        tournament=cfg.data.tournament,
-        dataset_filename=cfg.data.dataset_filename,
-        target_column=cfg.training.target_column,
-        feature_columns=list(cfg.training.feature_columns),
+        tournament=data_cfg["tournament"],
+        dataset_filename=data_cfg["dataset_filename"],
+        target_column=training_cfg["target_column"],
+        feature_columns=list(training_cfg["feature_columns"]),
+        row_filter=build_row_filter(data_cfg.get("row_filter")),
+        feather_cache=bool(data_cfg.get("feather_cache", False)),
     )
     if dataset is None:
         logger.error("Не удалось подготовить датасет — выход")
@@ -91,101 +232,150 @@ def run(cfg: DictConfig) -> None:
 
     X, y = dataset
 
+    # Тяжёлые зависимости импортируем только когда данные готовы:
+    # --help и ранние выходы не платят за загрузку mlflow/sklearn/catboost
+    import mlflow
+    from catboost import CatBoostClassifier, Pool
+    from mlflow.entities import Metric, Param, RunTag
+    from sklearn.metrics import roc_auc_score
+    from sklearn.model_selection import StratifiedShuffleSplit
+
     # ---------- MLflow: базовая настройка трекинга ----------
     # Пытаемся взять настройки из конфигурации (группа mlflow),
     # иначе используем локальный каталог mlruns в корне проекта.
-    if "mlflow" in cfg:
-        tracking_uri = cfg.mlflow.get("tracking_uri", None)
-        experiment_name = cfg.mlflow.get("experiment_name", None)
-    else:
-        tracking_uri = None
-        experiment_name = None
+    mlflow_cfg = conf.get("mlflow") or {}
+    tracking_uri = mlflow_cfg.get("tracking_uri")
+    experiment_name = mlflow_cfg.get("experiment_name")
 
     if not tracking_uri:
-        tracking_uri = f"file:{PROJECT_ROOT / 'mlruns'}"
+        tracking_uri = f"file:{_project_root() / 'mlruns'}"
     if not experiment_name:
         experiment_name = "sports_forecast"
 
     mlflow.set_tracking_uri(tracking_uri)
     mlflow.set_experiment(experiment_name)
 
-    run_name = f"{cfg.data.tournament}_{cfg.model.name}"
+    run_name = f"{data_cfg['tournament']}_{model_cfg['name']}"
 
     with mlflow.start_run(run_name=run_name):
-        # ---------- Логируем общую информацию о данных и конфиге ----------
-        mlflow.set_tag("tournament", cfg.data.tournament)
-        mlflow.set_tag("model_name", cfg.model.name)
-        mlflow.set_tag("dataset_filename", cfg.data.dataset_filename)
-
-        # Сохраняем полный Hydra-конфиг как артефакт
-        mlflow.log_text(OmegaConf.to_yaml(cfg), "config.yaml")
-
-        # Размеры датасета
-        mlflow.log_param("n_samples", len(X))
-        mlflow.log_param("n_features", X.shape[1])
-        mlflow.log_param("target_column", cfg.training.target_column)
+        client = mlflow.MlflowClient()
+        run_id = mlflow.active_run().info.run_id
 
-        # Список фичей отдельным артефактом
-        feature_columns = list(cfg.training.feature_columns)
-        mlflow.log_text("\n".join(feature_columns), "features.txt")
-
-        # Гиперпараметры модели (как есть из конфига)
-        if "params" in cfg.model:
-            mlflow.log_params({f"model__{k}": v for k, v in cfg.model.params.items()})
+        # ---------- Логируем общую информацию о данных и конфиге ----------
+        # Параметры и теги копим в списки и отправляем одним log_batch:
+        # каждый одиночный log_param/set_tag — отдельная транзакция бэкенда
+        tags = [
+            RunTag("tournament", data_cfg["tournament"]),
+            RunTag("model_name", model_cfg["name"]),
+            RunTag("dataset_filename", data_cfg["dataset_filename"]),
+        ]
+        params = [
+            Param("n_samples", str(len(X))),
+            Param("n_features", str(X.shape[1])),
+            Param("target_column", training_cfg["target_column"]),
+        ]
+
+        # Полный Hydra-конфиг и список фичей грузим одним log_artifacts:
+        # каждый log_text — отдельная загрузка на трекинг-сервер
+        feature_columns = list(training_cfg["feature_columns"])
+        with tempfile.TemporaryDirectory() as td:
+            Path(td, "config.yaml").write_text(OmegaConf.to_yaml(cfg), encoding="utf-8")
+            Path(td, "features.txt").write_text("\n".join(feature_columns), encoding="utf-8")
+            mlflow.log_artifacts(td, artifact_path="run_meta")
+
+        # Эффективные гиперпараметры модели — после авто-выбора устройства
+        # и GPU-дефолтов, а не сырые значения из конфига
+        model_params = _resolve_model_params(model_cfg)
+        params.extend(Param(f"model__{k}", str(v)) for k, v in model_params.items())
 
         # Параметры обучения (test_size, random_state, stratify)
-        mlflow.log_param("test_size", cfg.training.test_size)
-        mlflow.log_param("random_state", cfg.training.random_state)
-        mlflow.log_param("stratify", bool(cfg.training.get("stratify", False)))
-
-        stratify = y if cfg.training.get("stratify", False) else None
-        X_train, X_valid, y_train, y_valid = train_test_split(
-            X,
-            y,
-            test_size=cfg.training.test_size,
-            random_state=cfg.training.random_state,
-            stratify=stratify,
+        params.append(Param("test_size", str(training_cfg["test_size"])))
+        params.append(Param("random_state", str(training_cfg["random_state"])))
+        params.append(Param("stratify", str(bool(training_cfg.get("stratify", False)))))
+
+        # Сплит по индексам: train_test_split на датафреймах делает два
+        # полных fancy-index копирования pandas-блоков. Конвертируем фичи
+        # в float32 один раз и режем уже numpy-массивы
+        X_np = X.to_numpy(dtype=np.float32)
+        y_np = y.to_numpy()
+        del X
+
+        test_size = float(training_cfg["test_size"])
+        seed = int(training_cfg["random_state"])
+        if training_cfg.get("stratify", False):
+            splitter = StratifiedShuffleSplit(n_splits=1, test_size=test_size, random_state=seed)
+            train_idx, valid_idx = next(splitter.split(X_np, y_np))
+        else:
+            rng = np.random.default_rng(seed)
+            idx = rng.permutation(len(X_np))
+            cut = int(len(X_np) * (1 - test_size))
+            train_idx, valid_idx = idx[:cut], idx[cut:]
+
+        logger.info("Split: train=%d, valid=%d", len(train_idx), len(valid_idx))
+        params.append(Param("n_train", str(len(train_idx))))
+        params.append(Param("n_valid", str(len(valid_idx))))
+
+        logger.info("CatBoost task_type: %s", model_params["task_type"])
+        params.append(Param("task_type", model_params["task_type"]))
+
+        # Отправляем до fit, чтобы параметры сохранились даже при падении обучения
+        client.log_batch(run_id, params=params, tags=tags)
+
+        # CatBoost оптимизирован под float32 в F-order: массивы уже float32,
+        # остаётся выбрать строки и переложить в F-order. Полная матрица
+        # после этого не нужна — освобождаем память до обучения
+        y_valid = y_np[valid_idx]
+        train_pool = Pool(
+            np.asfortranarray(X_np[train_idx]),
+            y_np[train_idx],
+            feature_names=feature_columns,
         )
+        valid_pool = Pool(
+            np.asfortranarray(X_np[valid_idx]),
+            y_valid,
+            feature_names=feature_columns,
+        )
+        del X_np
 
-        logger.info("Split: train=%d, valid=%d", len(X_train), len(X_valid))
-        mlflow.log_param("n_train", len(X_train))
-        mlflow.log_param("n_valid", len(X_valid))
-
-        model = CatBoostClassifier(**cfg.model.params)
-        model.fit(X_train, y_train, eval_set=(X_valid, y_valid), use_best_model=True)
+        model = CatBoostClassifier(**model_params)
+        model.fit(train_pool, eval_set=valid_pool, use_best_model=True)
 
         # Базовая метрика (AUC) — логируем в MLflow
         try:
-            proba = model.predict_proba(X_valid)[:, 1]
+            proba = model.predict_proba(valid_pool)[:, 1]
             auc = roc_auc_score(y_valid, proba)
             logger.info("Valid AUC: %.4f", auc)
-            mlflow.log_metric("valid_auc", auc)
+            client.log_batch(
+                run_id,
+                metrics=[Metric("valid_auc", float(auc), int(time.time() * 1000), 0)],
+            )
         except Exception as e:
             logger.warning("Не удалось посчитать AUC: %s", e)
             mlflow.set_tag("auc_error", str(e))
 
-        tournament_models_dir = models_root / cfg.data.tournament
+        tournament_models_dir = models_root / data_cfg["tournament"]
         tournament_models_dir.mkdir(parents=True, exist_ok=True)
 
-        ext = cfg.model.get("save_format", "cbm")
-        model_path = tournament_models_dir / f"{cfg.model.name}.{ext}"
+        ext = model_cfg.get("save_format", "cbm")
+        model_path = tournament_models_dir / f"{model_cfg['name']}.{ext}"
 
-        model.save_model(str(model_path))
+        # pool при сохранении позволяет CatBoost выкинуть из файла
+        # неиспользуемые метаданные фич — файл меньше, load_model и
+        # загрузка артефакта в MLflow быстрее
+        model.save_model(str(model_path), format=ext, pool=train_pool)
         logger.info("Модель сохранена: %s", model_path)
 
         # ---------- Логирование модели в MLflow ----------
         # 1) логируем файл модели как артефакт
         mlflow.log_artifact(str(model_path), artifact_path="model_file")
 
-        # 2) логируем модель через CatBoost flavor (удобно для дальнейшего загрузки через MLflow)
+        # 2) логируем модель как pyfunc поверх уже сохранённого .cbm
+        # (mlflow.catboost.log_model сериализовал бы бустер второй раз)
         try:
-            mlflow.catboost.log_model(
-                model,
-                artifact_path="model",
-            )
+            _log_pyfunc_model(model_path)
         except Exception as e:
-            logger.warning("Не удалось залогировать модель через mlflow.catboost: %s", e)
-            mlflow.set_tag("mlflow_catboost_log_error", str(e))
+            logger.warning("Не удалось залогировать модель через mlflow.pyfunc: %s", e)
+            mlflow.set_tag("mlflow_pyfunc_log_error", str(e))
 
 
 if __name__ == "__main__":
@@ -57,15 +57,38 @@ See Also:
 
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import queue
 import sys
 from logging import Logger
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 
 #: Флаг инициализации системы логирования
 _LOG_CONFIGURED = False
 
+#: Обработчики, работающие за QueueListener; нужны для восстановления
+#: логирования в форкнутых процессах (см. :func:`_reattach_handlers_after_fork`)
+_DIRECT_HANDLERS: list[logging.Handler] = []
+
+
+def _reattach_handlers_after_fork() -> None:
+    """Вернуть прямые обработчики на корневой логгер в форкнутом процессе.
+
+    Поток :class:`~logging.handlers.QueueListener` не переживает fork, поэтому
+    дочерние процессы пулов писали бы в очередь, которую никто не читает.
+    """
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            root_logger.removeHandler(handler)
+    for handler in _DIRECT_HANDLERS:
+        if handler not in root_logger.handlers:
+            root_logger.addHandler(handler)
+
 
 def configure_logging(
     level: str = "INFO",
@@ -148,6 +171,9 @@ def configure_logging(
         * При некорректном значении ``level`` используется ``INFO``
         * Все логгеры в проекте наследуют эти настройки
         * Файл логов создается в кодировке UTF-8
+        * Запись в stdout/файл выполняется фоновым потоком через
+          :class:`logging.handlers.QueueListener`; поток останавливается
+          автоматически через :mod:`atexit`
 
     Warning:
         Вызов :func:`configure_logging` после создания логгеров не изменит
@@ -180,9 +206,24 @@ def configure_logging(
     for handler in handlers:
         handler.setFormatter(formatter)
 
+    # Реальные обработчики выносим за QueueListener: форматирование и запись
+    # в stdout/файл идут в фоновом потоке, и рабочий поток никогда не
+    # блокируется на flush диска. На корневом логгере остаётся только
+    # неблокирующий QueueHandler
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # В форкнутом ребёнке (ProcessPoolExecutor на Linux) листенера нет —
+    # возвращаем обработчики напрямую на корневой логгер
+    _DIRECT_HANDLERS.clear()
+    _DIRECT_HANDLERS.extend(handlers)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_reattach_handlers_after_fork)
+
     root_logger = logging.getLogger()
-    for handler in handlers:
-        root_logger.addHandler(handler)
+    root_logger.addHandler(QueueHandler(log_queue))
 
     # если передали что-то кривое, по умолчанию будет INFO
     root_logger.setLevel(getattr(logging, level.upper(), logging.INFO))
@@ -0,0 +1,60 @@
+"""Построение pyarrow-выражений фильтрации строк из конфига.
+
+Позволяет описывать фильтры декларативно в Hydra-конфиге::
+
+    data:
+      row_filter:
+        - column: "season"
+          op: ">="
+          value: 2022
+
+и превращает их в выражение для ``pyarrow.dataset``, которое отсекает
+целые row group'ы по статистикам футера parquet ещё до чтения данных.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+import pyarrow.compute as pc
+
+
+#: Поддерживаемые операторы сравнения в спеках фильтра
+_OPS: dict[str, Any] = {
+    "==": lambda field, value: field == value,
+    "!=": lambda field, value: field != value,
+    ">": lambda field, value: field > value,
+    ">=": lambda field, value: field >= value,
+    "<": lambda field, value: field < value,
+    "<=": lambda field, value: field <= value,
+    "in": lambda field, value: field.isin(list(value)),
+}
+
+
+def build_row_filter(specs: Iterable[Mapping[str, Any]] | None) -> pc.Expression | None:
+    """Собрать фильтр pyarrow из списка спеков ``{column, op, value}``.
+
+    Args:
+        specs: Список спеков фильтра из конфига (или None/пустой список).
+            Спеки объединяются через логическое И.
+
+    Returns:
+        Выражение для ``pyarrow.dataset.Dataset.to_table(filter=...)``
+        или None, если фильтры не заданы.
+
+    Raises:
+        ValueError: Если в спеке указан неподдерживаемый оператор.
+    """
+    if not specs:
+        return None
+
+    expr: pc.Expression | None = None
+    for spec in specs:
+        op = spec.get("op", "==")
+        if op not in _OPS:
+            raise ValueError(f"Неподдерживаемый оператор фильтра: {op!r}")
+        clause = _OPS[op](pc.field(spec["column"]), spec["value"])
+        expr = clause if expr is None else expr & clause
+
+    return expr